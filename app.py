@@ -1,45 +1,242 @@
 import os
 import io
-import base64
+import functools
+import hashlib
+import importlib.util
+import json
 import mimetypes
+import sqlite3
+import tempfile
+import threading
 import time
+import zipfile
 import re
 import socket
 import ipaddress
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 
-from flask import Flask, request, send_file, make_response
+from flask import Flask, Response, request, send_file, make_response, jsonify
 from flask import render_template_string
-from openai import OpenAI
+from openai import DefaultHttpxClient, NotFoundError, OpenAI
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from pypdf import PdfReader
 from docx import Document
+from lxml import etree
+import numpy as np
 import pandas as pd
 
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: images are sent at their original size
+    Image = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # optional: falls back to regex HTML stripping
+    HTMLParser = None
+
+try:
+    import diskcache
+except ImportError:  # optional: deterministic narration scripts are not cached without it
+    diskcache = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional: the semantic narration cache is disabled without it
+    SentenceTransformer = None
+
 # ---------- CONFIG ----------
 
-client = OpenAI()  # uses OPENAI_API_KEY from environment
+# One pooled HTTP client for chat, TTS, transcription, files and embeddings;
+# HTTP/2 (when the h2 package is installed) multiplexes them over a single connection.
+# DefaultHttpxClient keeps the SDK's defaults (e.g. follow_redirects) for anything not set here.
+openai_http_client = DefaultHttpxClient(
+    http2=importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    # the SDK's 600s read timeout: non-streaming 1200-token chats, long transcriptions
+    # and batch result downloads can all run well past a minute
+    timeout=httpx.Timeout(600.0, connect=5.0),
+)
+client = OpenAI(http_client=openai_http_client)  # uses OPENAI_API_KEY from environment
 
 TTS_MODEL = "gpt-4o-mini-tts"          # text → speech :contentReference[oaicite:0]{index=0}
 STT_MODEL = "gpt-4o-mini-transcribe"   # speech → text :contentReference[oaicite:1]{index=1}
 LLM_MODEL = "gpt-4o-mini"              # text/image → “narration script” :contentReference[oaicite:2]{index=2}
 URL_FETCH_TIMEOUT = 10  # seconds for remote fetches
+URL_CONNECT_TIMEOUT = 3.05  # seconds to establish the connection (separate from the read timeout)
+URL_CACHE_PATH = os.environ.get("URL_CACHE_PATH", "url_cache.sqlite3")
+URL_CACHE_MAX_ENTRIES = 1000  # most recently fetched URLs kept for conditional GETs
+DNS_CACHE_TTL = 60  # seconds a hostname's public/private verdict is reused by validate_public_url
+URL_USER_AGENT = "Speech-to-Text-Light/1.0 (+https://github.com/LetsVenture2021/Speech-to-Text-Light)"
+# faster multi-threaded / Rust readers for tabular uploads, used when installed
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else None
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+VISION_MAX_SIDE = 1024  # px; larger images are downscaled before upload, the model would anyway
+VISION_FILE_CACHE_MAX = 256  # image hashes remembered for Files API reuse
+VISION_FILE_TTL = 3600  # seconds before an uploaded image is deleted by the Files API (minimum allowed)
+VISION_FILE_REUSE_MARGIN = 300  # stop reusing a file id this many seconds before it expires
+UPLOAD_MAX_WORKERS = 8      # concurrent parsers when several files are attached
+
+LLM_CACHE_DIR = os.environ.get("LLM_CACHE_DIR", "llm_cache")
+LLM_CACHE_TTL = 7 * 24 * 3600  # seconds a deterministic narration script is reused
+# document uploads are narrated at temperature 0 (and exactly cached); typed text and URLs are not
+DETERMINISTIC_MODALITIES = {
+    "pdf-document", "word-document", "text-document", "structured-data", "multi-file",
+}
+
+TTS_VOICE = "coral"
+# optional: add extra style guidance
+TTS_INSTRUCTIONS = (
+    "Read as a calm, clear narrator. Vary intonation slightly to match emotion, "
+    "but stay professional and easy to follow."
+)
+TTS_CACHE_DIR = Path(os.environ.get("TTS_CACHE_DIR", "tts_cache"))
+TTS_CACHE_TTL = 7 * 24 * 3600  # seconds before a cached MP3 is re-synthesized
+TTS_CACHE_MAX_BYTES = 1 << 30   # total size of cached MP3s; the oldest are deleted beyond it
+TTS_CACHE_SWEEP_INTERVAL = 3600  # seconds between sweeps of expired/excess cached MP3s
+TTS_CHUNK_CHARS = 240   # after the first sentence, batch sentences into TTS calls of about this size
+TTS_PIPELINE_WORKERS = 4  # concurrent TTS calls while the narration script is still streaming
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"   # local 384-d sentence embeddings for the semantic cache
+EMBEDDING_API_MODEL = "text-embedding-3-small"  # used for chunk selection when no local model is installed
+NARRATION_CHUNK_TOKENS = 500  # approximate size of each chunk of long inputs
+# estimated input tokens above which long inputs are trimmed to representative chunks;
+# gpt-4o-mini has a 128k context, the rest covers the system prompt, the script and estimate error
+NARRATION_PROMPT_BUDGET_TOKENS = int(os.environ.get("NARRATION_PROMPT_BUDGET_TOKENS", "100000"))
+NARRATION_CACHE_PATH = os.environ.get("NARRATION_CACHE_PATH", "narration_cache.sqlite3")
+NARRATION_CACHE_MAX_ENTRIES = 1000
+# cosine similarity needed to reuse a cached narration; set above 1 to disable the cache
+CACHE_SIM_THRESHOLD = float(os.environ.get("CACHE_SIM_THRESHOLD", "0.92"))
+BATCH_MAX_INPUTS = 100  # per /api/batch request; each input is normalized (URLs fetched) synchronously
 
 # ---------- FLASK APP ----------
 
 app = Flask(__name__)
 
+# ---------- HTTP SESSION ----------
+
+# One pooled keep-alive session for remote fetches, so repeat hosts skip the TCP/TLS handshake
+http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+http_session.mount("http://", _http_adapter)
+http_session.mount("https://", _http_adapter)
+http_session.headers["User-Agent"] = URL_USER_AGENT
+
+
+class UrlCache:
+    """
+    Stripped page text per URL with its ETag / Last-Modified validators,
+    so a re-fetch can be a conditional GET answered by 304 Not Modified.
+    Only the `max_entries` most recently stored URLs are kept.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS url_cache ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, text TEXT, ts INTEGER)"
+        )
+        self._db.commit()
+
+    def get(self, url: str) -> tuple[str | None, str | None, str] | None:
+        """Return (etag, last_modified, text) for `url`, if cached."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, text FROM url_cache WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None:
+                # revalidated pages count as recent, so pruning drops the least used ones
+                self._db.execute("UPDATE url_cache SET ts = ? WHERE url = ?", (time.time_ns(), url))
+                self._db.commit()
+            return row
+
+    def put(self, url: str, etag: str | None, last_modified: str | None, text: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO url_cache (url, etag, last_modified, text, ts) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, text, time.time_ns()),
+            )
+            self._db.execute(
+                "DELETE FROM url_cache WHERE url IN ("
+                "SELECT url FROM url_cache ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+
+url_cache = UrlCache(URL_CACHE_PATH, URL_CACHE_MAX_ENTRIES)
+
 # ---------- UTILITIES ----------
 
 URL_REGEX = re.compile(r"^https?://", re.IGNORECASE)
+SENTENCE_END_REGEX = re.compile(r"(?<=[.!?])\s+")
+PARAGRAPH_REGEX = re.compile(r"\n\s*\n")
+SCRIPT_TAG_REGEX = re.compile(r"<script.*?</script>", re.DOTALL | re.IGNORECASE)
+STYLE_TAG_REGEX = re.compile(r"<style.*?</style>", re.DOTALL | re.IGNORECASE)
+HTML_TAG_REGEX = re.compile(r"<[^>]+>")
+WHITESPACE_REGEX = re.compile(r"\s+")
 
 
 def looks_like_url(text: str) -> bool:
     return bool(URL_REGEX.match(text.strip()))
 
 
+def is_disallowed_ip(ip_obj: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    """True for any address that is not a public unicast destination (private, CGNAT, loopback, ...)."""
+    if isinstance(ip_obj, ipaddress.IPv6Address) and ip_obj.ipv4_mapped:
+        ip_obj = ip_obj.ipv4_mapped
+    return (
+        ip_obj.is_private
+        or ip_obj.is_loopback
+        or ip_obj.is_link_local
+        or ip_obj.is_reserved
+        or ip_obj.is_multicast
+        or ip_obj.is_unspecified
+        or not ip_obj.is_global
+    )
+
+
+def check_host_resolution(hostname: str) -> str | None:
+    """
+    Resolve `hostname` and require every returned address (IPv4 and IPv6) to be public,
+    so a multi-record answer cannot smuggle in an internal IP.
+    Returns: rejection_reason or None
+    """
+    try:
+        addr_infos = socket.getaddrinfo(hostname, None)
+    except Exception as err:
+        return f"failed host resolution ({hostname}): {err}"
+
+    for *_, sockaddr in addr_infos:
+        ip_str = sockaddr[0]
+        try:
+            ip_obj = ipaddress.ip_address(ip_str)
+        except ValueError:
+            return f"resolution returned invalid IP ({ip_str})"
+        if is_disallowed_ip(ip_obj):
+            return f"destination resolves to disallowed IP ({ip_str})"
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_host_resolution(hostname: str, ttl_bucket: int) -> str | None:
+    # ttl_bucket changes every DNS_CACHE_TTL seconds, expiring old verdicts
+    return check_host_resolution(hostname)
+
+
 def validate_public_url(url: str) -> tuple[str | None, str | None]:
     """
     Enforce that a URL uses HTTP(S) and resolves only to public IPs.
@@ -55,26 +252,9 @@ def validate_public_url(url: str) -> tuple[str | None, str | None]:
     if hostname.lower() == "localhost":
         return None, "localhost is not allowed"
 
-    try:
-        addr_infos = socket.getaddrinfo(hostname, None)
-    except Exception as err:
-        return None, f"failed host resolution ({hostname}): {err}"
-
-    for _, _, _, _, sockaddr in addr_infos:
-        ip_str = sockaddr[0]
-        try:
-            ip_obj = ipaddress.ip_address(ip_str)
-        except ValueError:
-            return None, f"resolution returned invalid IP ({ip_str})"
-
-        if (
-            ip_obj.is_private
-            or ip_obj.is_loopback
-            or ip_obj.is_link_local
-            or ip_obj.is_reserved
-        ):
-            return None, f"destination resolves to disallowed IP ({ip_str})"
-
+    reason = _cached_host_resolution(hostname.lower(), int(time.monotonic() // DNS_CACHE_TTL))
+    if reason:
+        return None, reason
     return url, None
 
 
@@ -85,106 +265,291 @@ def fetch_url_text(url: str) -> str:
         return f"URL rejected for security reasons: {reason}"
 
     try:
-        # Re-resolve hostname and ensure it maps to a public IP, to prevent SSRF via DNS rebinding or race conditions
-        parsed = urlparse(safe_url)
-        final_host = parsed.hostname or ""
-        # Defensive: catch resolution errors
-        try:
-            resolved_ip = socket.gethostbyname(final_host)
-            ip_obj = ipaddress.ip_address(resolved_ip)
-            # Check public-ness
-            if (
-                ip_obj.is_private
-                or ip_obj.is_loopback
-                or ip_obj.is_link_local
-                or ip_obj.is_reserved
-            ):
-                return f"URL rejected: destination resolves to disallowed IP ({resolved_ip})"
-        except Exception as err:
-            return f"URL rejected: failed host resolution ({final_host}): {err}"
-        # Safe to proceed after re-validation
-        resp = requests.get(safe_url, timeout=URL_FETCH_TIMEOUT, allow_redirects=False)
+        # Re-resolve hostname (uncached) and ensure every address is public,
+        # to prevent SSRF via DNS rebinding or race conditions
+        final_host = urlparse(safe_url).hostname or ""
+        reason = check_host_resolution(final_host)
+        if reason:
+            return f"URL rejected: {reason}"
+        # Safe to proceed after re-validation; revalidate any cached copy instead of re-downloading
+        cached = url_cache.get(safe_url)
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        resp = http_session.get(
+            safe_url,
+            headers=headers,
+            timeout=(URL_CONNECT_TIMEOUT, URL_FETCH_TIMEOUT),
+            allow_redirects=False,
+        )
+        if resp.status_code == 304 and cached:
+            return cached[2]
         resp.raise_for_status()
         html = resp.text
     except Exception as e:
         return f"Failed to fetch URL {safe_url}: {e}"
 
+    text = html_to_text(html)
+    etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        url_cache.put(safe_url, etag, last_modified, text)
+    return text
+
+
+def html_to_text(html: str) -> str:
+    """Strip scripts/styles/tags and collapse whitespace, via selectolax (Lexbor) when available."""
+    if HTMLParser is not None:
+        try:
+            tree = HTMLParser(html)
+            for node in tree.css("script, style, noscript"):
+                node.decompose()
+            root = tree.body or tree.root
+            text = root.text(separator=" ", strip=True) if root is not None else ""
+            return WHITESPACE_REGEX.sub(" ", text).strip()
+        except Exception:
+            pass  # malformed markup: fall through to the regex path
+
     # ultra-lightweight HTML stripping
     # (you can swap this for BeautifulSoup / readability if you want)
-    text = re.sub(r"<script.*?</script>", "", html, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<style.*?</style>", "", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    text = SCRIPT_TAG_REGEX.sub("", html)
+    text = STYLE_TAG_REGEX.sub("", text)
+    text = HTML_TAG_REGEX.sub(" ", text)
+    text = WHITESPACE_REGEX.sub(" ", text)
     return text.strip()
 
 
+def _safe_extract(page) -> str | None:
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return None
+
+
 def extract_text_from_pdf(file_stream) -> str:
     reader = PdfReader(file_stream)
-    pages = []
-    for page in reader.pages:
-        try:
-            pages.append(page.extract_text() or "")
-        except Exception:
+    pages = (_safe_extract(page) for page in reader.pages)
+    return "\n\n".join(text for text in pages if text is not None)
+
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P = f"{W_NS}p"
+W_TXBX = f"{W_NS}txbxContent"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def _docx_lines(element, lines: list[str]) -> None:
+    """Append the lines of every paragraph under `element`, in document order."""
+    for child in element:
+        if child.tag == MC_FALLBACK:
             continue
-    return "\n\n".join(pages)
+        if child.tag == W_P:
+            lines.extend(_docx_paragraph_lines(child))
+        else:
+            _docx_lines(child, lines)
+
+
+def _docx_paragraph_lines(para) -> list[str]:
+    """
+    A paragraph's text, followed by the paragraphs of any text boxes anchored in it.
+    Word stores each text box twice (DrawingML under mc:Choice, a VML copy under
+    mc:Fallback), so mc:Fallback content is skipped.
+    """
+    parts, boxes = [], []
+
+    def walk(element):
+        for node in element:
+            if node.tag == MC_FALLBACK:
+                continue
+            if node.tag == W_TXBX:
+                _docx_lines(node, boxes)
+            elif node.tag == f"{W_NS}t":
+                parts.append(node.text or "")
+            elif node.tag == f"{W_NS}tab":
+                parts.append("\t")
+            elif node.tag in (f"{W_NS}br", f"{W_NS}cr"):
+                parts.append("\n")
+            else:
+                walk(node)
+
+    walk(para)
+    return ["".join(parts), *boxes]
 
 
 def extract_text_from_docx(file_stream) -> str:
-    # python-docx expects a path or file-like; BytesIO works.
-    doc = Document(file_stream)
-    return "\n".join(p.text for p in doc.paragraphs)
+    """
+    Stream paragraphs straight out of word/document.xml with lxml.iterparse instead of
+    building python-docx's object tree; each paragraph is cleared and detached once read.
+    Body and table-cell paragraphs are emitted in order; text-box paragraphs follow
+    the paragraph they are anchored in.
+    """
+    try:
+        with zipfile.ZipFile(file_stream) as archive, archive.open("word/document.xml") as xml:
+            paragraphs = []
+            for _, para in etree.iterparse(xml, events=("end",), tag=W_P):
+                # text-box paragraphs are read with their host paragraph, duplicates not at all
+                if next(para.iterancestors(W_TXBX, MC_FALLBACK), None) is not None:
+                    continue
+                paragraphs.extend(_docx_paragraph_lines(para))
+                para.clear()
+                # drop everything already read (earlier paragraphs, finished cells/rows/tables)
+                # so the partial tree stays small however long the document is
+                for node in (para, *para.iterancestors()):
+                    while node.getprevious() is not None:
+                        del node.getparent()[0]
+            return "\n".join(paragraphs)
+    except KeyError:
+        # main part stored under a non-standard name: let python-docx resolve it
+        file_stream.seek(0)
+        doc = Document(file_stream)
+        return "\n".join(p.text for p in doc.paragraphs)
 
 
 def extract_text_from_plain(file_stream) -> str:
     return file_stream.read().decode("utf-8", errors="ignore")
 
 
+def read_table(file_stream, ext: str) -> pd.DataFrame:
+    """Load a CSV/Excel upload, preferring the pyarrow/calamine engines when available."""
+    reader = pd.read_csv if ext == ".csv" else pd.read_excel
+    engine = CSV_ENGINE if ext == ".csv" else EXCEL_ENGINE
+    if engine:
+        try:
+            return reader(file_stream, engine=engine)
+        except Exception:
+            # e.g. ragged rows pyarrow rejects or an older pandas without calamine
+            file_stream.seek(0)
+    return reader(file_stream)
+
+
+def summarize_table_dict(df: pd.DataFrame) -> dict:
+    """
+    Structured table summary:
+    {"n_rows", "n_cols", "columns": [...], "stats": [(column, {"mean", "min", "max"}), ...]}
+    `stats` covers numeric columns only, in column order (one pair per column, so duplicate
+    labels are kept), and is empty for tables without numeric data/rows.
+    """
+    stats = []
+    numeric = df.select_dtypes(include="number")
+    if not numeric.empty:
+        # only mean/min/max are reported, so skip describe()'s quantiles and std;
+        # zipping the reduced arrays avoids a per-column label lookup
+        for col, mean, lo, hi in zip(
+            numeric.columns,
+            numeric.mean().to_numpy(),
+            numeric.min().to_numpy(),
+            numeric.max().to_numpy(),
+        ):
+            stats.append((col, {"mean": float(mean), "min": float(lo), "max": float(hi)}))
+    return {
+        "n_rows": df.shape[0],
+        "n_cols": df.shape[1],
+        "columns": list(df.columns),
+        "stats": stats,
+    }
+
+
 def summarize_table(df: pd.DataFrame) -> str:
     """Turn a dataframe into a compact textual description."""
+    summary = summarize_table_dict(df)
     buf = []
-    buf.append(f"Table shape: {df.shape[0]} rows x {df.shape[1]} columns.")
-    buf.append(f"Columns: {', '.join(map(str, df.columns))}.")
+    buf.append(f"Table shape: {summary['n_rows']} rows x {summary['n_cols']} columns.")
+    buf.append(f"Columns: {', '.join(map(str, summary['columns']))}.")
     # Simple stats on numeric columns
-    numeric = df.select_dtypes(include="number")
-    if not numeric.empty:
-        desc = numeric.describe().to_dict()
+    if summary["stats"]:
         buf.append("Numeric summary (per column):")
-        for col, stats in desc.items():
-            buf.append(
-                f"- {col}: mean={stats.get('mean'):.3g}, "
-                f"min={stats.get('min'):.3g}, max={stats.get('max'):.3g}"
-            )
+        buf.extend(
+            f"- {col}: mean={st['mean']:.3g}, min={st['min']:.3g}, max={st['max']:.3g}"
+            for col, st in summary["stats"]
+        )
     return "\n".join(buf)
 
 
+# sha256(image bytes) -> (uploaded file id, local expiry time), oldest first
+_vision_file_ids: dict[str, tuple[str, float]] = {}
+_vision_file_lock = threading.Lock()
+
+
+def upload_vision_file(img_bytes: bytes, filename: str, mime_type: str) -> str:
+    """
+    Upload an image via the Files API; repeats of the same bytes reuse its file id.
+    Uploads expire remotely after VISION_FILE_TTL so user images are not kept in the
+    org's storage, and the local entry is dropped shortly before that.
+    """
+    digest = hashlib.sha256(img_bytes).hexdigest()
+    now = time.time()
+    with _vision_file_lock:
+        cached = _vision_file_ids.get(digest)
+        if cached and cached[1] <= now:
+            del _vision_file_ids[digest]
+            cached = None
+    if cached:
+        return cached[0]
+
+    uploaded = client.files.create(
+        file=(filename or "image", img_bytes, mime_type),
+        purpose="vision",
+        expires_after={"anchor": "created_at", "seconds": VISION_FILE_TTL},
+    )
+    with _vision_file_lock:
+        if len(_vision_file_ids) >= VISION_FILE_CACHE_MAX:
+            _vision_file_ids.pop(next(iter(_vision_file_ids)))
+        _vision_file_ids[digest] = (uploaded.id, now + VISION_FILE_TTL - VISION_FILE_REUSE_MARGIN)
+    return uploaded.id
+
+
+def shrink_image(img_bytes: bytes, filename: str) -> tuple[bytes, str]:
+    """
+    Downscale images whose long side exceeds VISION_MAX_SIDE and re-encode as JPEG
+    (transparent areas become white).
+    Returns: (image bytes, filename) — unchanged if small, unreadable, or Pillow is missing.
+    """
+    if Image is None:
+        return img_bytes, filename
+    try:
+        img = Image.open(io.BytesIO(img_bytes))
+        if max(img.size) <= VISION_MAX_SIDE:
+            return img_bytes, filename
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+            # JPEG has no alpha: flatten onto white, or transparent backgrounds turn black
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, "white")
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            img = img.convert("RGB")
+        img.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=85, optimize=True)
+    except Exception:
+        return img_bytes, filename
+    return out.getvalue(), f"{Path(filename).stem or 'image'}.jpg"
+
+
 def interpret_image_to_text(img_bytes: bytes, filename: str) -> str:
     """Send an image to gpt-4o-mini and ask for a descriptive, narration-ready text."""
-    b64 = base64.b64encode(img_bytes).decode("utf-8")
+    img_bytes, filename = shrink_image(img_bytes, filename)
     mime_type = mimetypes.guess_type(filename)[0] or "image/png"
+    # referencing an uploaded file avoids inlining a 4/3-larger base64 payload
+    file_id = upload_vision_file(img_bytes, filename, mime_type)
 
-    res = client.chat.completions.create(
+    res = client.responses.create(
         model=LLM_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a 'vision adapter' for a voice reader. "
-                    "Describe this image as if you are narrating it out loud: "
-                    "clear, vivid, but concise. Highlight trends if it is a chart/diagram."
-                ),
-            },
+        instructions=(
+            "You are a 'vision adapter' for a voice reader. "
+            "Describe this image as if you are narrating it out loud: "
+            "clear, vivid, but concise. Highlight trends if it is a chart/diagram."
+        ),
+        input=[
             {
                 "role": "user",
                 "content": [
+                    {"type": "input_image", "file_id": file_id},
                     {
-                        "type": "input_image",
-                        "image": {
-                            "data": b64,
-                            "media_type": mime_type,
-                        },
-                    },
-                    {
-                        "type": "text",
+                        "type": "input_text",
                         "text": "Describe this image for spoken narration.",
                     },
                 ],
@@ -192,17 +557,17 @@ def interpret_image_to_text(img_bytes: bytes, filename: str) -> str:
         ],
     )  # :contentReference[oaicite:3]{index=3}
 
-    return res.choices[0].message.content
+    return res.output_text
 
 
-def run_inflective_emergence_loop(raw_text: str, modality: str) -> str:
+def build_narration_messages(raw_text: str, modality: str) -> list[dict]:
     """
     Central brain:
     - semantic layer (understand content)
     - emotion inference
     - identity kernel + drift-aware memory
     - prosody-aware narration script
-    Returns: text that is ready to be sent to TTS.
+    Returns: chat messages whose completion is text ready to be sent to TTS.
     """
     system_prompt = f"""
 You are an 'Inflective Emergence Loop' driving a voice-only content reader.
@@ -219,40 +584,189 @@ Constraints:
 - No meta-commentary like "the following text says".
 - Do not mention the pipeline or that you are an AI.
 """
+    return [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": f"Source modality: {modality}\n\nRaw content:\n{raw_text}",
+        },
+    ]
+
+
+# Exact-match cache of narration scripts; only temperature-0 (deterministic) runs are stored
+llm_cache = (
+    diskcache.Cache(LLM_CACHE_DIR, size_limit=2 << 30, eviction_policy="least-recently-used")
+    if diskcache is not None
+    else None
+)
+
+
+def _narration_cache_key(messages: list[dict], raw_text: str, modality: str) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            {"m": LLM_MODEL, "s": messages[0]["content"], "u": raw_text, "mod": modality, "t": 0},
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def run_inflective_emergence_loop(raw_text: str, modality: str) -> str:
+    """Run the Inflective Emergence Loop and return the full narration script."""
     resp = client.chat.completions.create(
         model=LLM_MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": f"Source modality: {modality}\n\nRaw content:\n{raw_text}",
-            },
-        ],
+        messages=build_narration_messages(raw_text, modality),
         temperature=0.7,
         max_tokens=1200,
     )
     return resp.choices[0].message.content
 
 
+def stream_narration_sentences(raw_text: str, modality: str, deterministic: bool = False):
+    """
+    Same as run_inflective_emergence_loop, but streams the script and yields it sentence by sentence.
+    deterministic=True runs at temperature 0 and reuses exact-match cached scripts.
+    """
+    messages = build_narration_messages(raw_text, modality)
+    key = _narration_cache_key(messages, raw_text, modality) if deterministic and llm_cache else None
+    if key:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            yield from (sentence for sentence in SENTENCE_END_REGEX.split(cached.strip()) if sentence)
+            return
+
+    stream = client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=messages,
+        temperature=0 if deterministic else 0.7,
+        max_tokens=1200,
+        stream=True,
+    )
+    buf, script, finish_reason = "", [], None
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        finish_reason = chunk.choices[0].finish_reason or finish_reason
+        delta = chunk.choices[0].delta.content or ""
+        script.append(delta)
+        buf += delta
+        *complete, buf = SENTENCE_END_REGEX.split(buf)
+        for sentence in complete:
+            if sentence.strip():
+                yield sentence.strip()
+    if buf.strip():
+        yield buf.strip()
+    # a script cut off at max_tokens is not worth serving again for LLM_CACHE_TTL
+    if key and finish_reason != "length":
+        llm_cache.set(key, "".join(script), expire=LLM_CACHE_TTL)
+
+
+@functools.lru_cache(maxsize=256)
+def _read_cached_audio(path: str, mtime_ns: int) -> bytes:
+    # mtime is part of the key so a rewritten file is never served stale from memory
+    return Path(path).read_bytes()
+
+
+_tts_sweep_lock = threading.Lock()
+_tts_last_sweep = 0.0
+
+
+def sweep_tts_cache() -> None:
+    """
+    Delete cached MP3s (and stray temp files) older than TTS_CACHE_TTL, then the
+    oldest remaining ones until the cache fits in TTS_CACHE_MAX_BYTES.
+    """
+    now = time.time()
+    entries = []
+    for path in TTS_CACHE_DIR.glob("*/*"):
+        try:
+            st = path.stat()
+            if now - st.st_mtime >= TTS_CACHE_TTL:
+                path.unlink()
+            else:
+                entries.append((st.st_mtime, st.st_size, path))
+        except OSError:
+            pass  # removed concurrently by another worker
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= TTS_CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        total -= size
+
+
+def _maybe_sweep_tts_cache() -> None:
+    """Start a background sweep at most once per TTS_CACHE_SWEEP_INTERVAL."""
+    global _tts_last_sweep
+    with _tts_sweep_lock:
+        if time.time() - _tts_last_sweep < TTS_CACHE_SWEEP_INTERVAL:
+            return
+        _tts_last_sweep = time.time()
+    threading.Thread(target=sweep_tts_cache, daemon=True).start()
+
+
+def cached_tts(func):
+    """
+    Exact-match cache for TTS: identical (model, voice, instructions, text) returns the
+    MP3 stored under TTS_CACHE_DIR instead of calling the Audio API again.
+    Misses periodically trigger sweep_tts_cache so the directory stays bounded.
+    """
+
+    @functools.wraps(func)
+    def wrapper(narration_text: str) -> bytes:
+        key = hashlib.sha256(
+            json.dumps(
+                {"m": TTS_MODEL, "v": TTS_VOICE, "i": TTS_INSTRUCTIONS, "t": narration_text},
+                sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()
+        path = TTS_CACHE_DIR / key[:2] / f"{key}.mp3"
+        try:
+            st = path.stat()
+            if time.time() - st.st_mtime < TTS_CACHE_TTL:
+                return _read_cached_audio(str(path), st.st_mtime_ns)
+        except OSError:
+            pass
+
+        audio_bytes = func(narration_text)
+        _maybe_sweep_tts_cache()
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # unique per process and thread, so concurrent gunicorn workers never share a temp file
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+                tmp_name = tmp.name
+                tmp.write(audio_bytes)
+            os.replace(tmp_name, path)
+        except OSError:
+            # caching is best-effort; never fail the request over it, but leave no stray temp file
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+        return audio_bytes
+
+    return wrapper
+
+
+@cached_tts
 def text_to_speech(narration_text: str) -> bytes:
     """
     Use the Audio API to turn text into speech.
     We rely on the fact that audio.speech.create returns raw audio bytes. :contentReference[oaicite:4]{index=4}
     """
-    # optional: add extra style guidance
-    instructions = (
-        "Read as a calm, clear narrator. Vary intonation slightly to match emotion, "
-        "but stay professional and easy to follow."
-    )
-
-    audio_bytes = client.audio.speech.create(
+    speech = client.audio.speech.create(
         model=TTS_MODEL,
-        voice="coral",
+        voice=TTS_VOICE,
         input=narration_text,
-        instructions=instructions,
+        instructions=TTS_INSTRUCTIONS,
         response_format="mp3",
     )
-    return audio_bytes
+    return speech.content
 
 
 def transcribe_audio(file_obj) -> str:
@@ -264,45 +778,286 @@ def transcribe_audio(file_obj) -> str:
     return transcript.text
 
 
+# ---------- SEMANTIC CACHE ----------
+
+@functools.lru_cache(maxsize=1)
+def get_embedder():
+    """
+    Load the local embedding model once; None when sentence-transformers is not installed
+    or the model cannot be loaded (e.g. offline without a cached copy), which also turns
+    the semantic cache off.
+    """
+    global narration_cache
+    if SentenceTransformer is None:
+        return None
+    try:
+        return SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:
+        app.logger.warning("Embedding model %s unavailable, semantic cache disabled: %s", EMBEDDING_MODEL, e)
+        narration_cache = None
+        return None
+
+
+def chunk_text(text: str, max_tokens: int = NARRATION_CHUNK_TOKENS) -> list[str]:
+    """Split text on paragraph boundaries into chunks of roughly `max_tokens` tokens."""
+    max_chars = max_tokens * 4  # rough chars-per-token estimate
+    pieces = []
+    for para in PARAGRAPH_REGEX.split(text):
+        para = para.strip()
+        if len(para) <= max_chars:
+            if para:
+                pieces.append(para)
+            continue
+        # oversized paragraphs (e.g. whitespace-collapsed web pages) fall back to sentences
+        for sentence in SENTENCE_END_REGEX.split(para):
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def embed_texts(texts: list[str]) -> np.ndarray:
+    """
+    Embed all texts in a single batched call; rows are unit-normalized.
+    Uses the local model when installed, otherwise one OpenAI embeddings request.
+    """
+    embedder = get_embedder()
+    if embedder is not None:
+        return np.asarray(embedder.encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+    resp = client.embeddings.create(model=EMBEDDING_API_MODEL, input=texts)
+    mat = np.array([item.embedding for item in resp.data], dtype=np.float32)
+    return mat / np.linalg.norm(mat, axis=1, keepdims=True)
+
+
+def prepare_narration_source(text: str, with_embedding: bool = True) -> tuple[str, np.ndarray | None]:
+    """
+    Chunk and batch-embed the normalized input.
+    Returns: (text to narrate, embedding for the semantic cache or None)
+    with_embedding=False skips the cache embedding for callers that never look it up.
+    Only inputs over NARRATION_PROMPT_BUDGET_TOKENS are trimmed: the first and last chunks
+    plus those closest to the document centroid, kept in their original order, up to the budget.
+    Nothing is embedded unless the semantic cache is on or trimming is needed.
+    """
+    needs_selection = len(text) / 4 > NARRATION_PROMPT_BUDGET_TOKENS  # rough chars-per-token estimate
+    # the cache needs the local model; loading it first lets a failed load disable the cache
+    use_cache = with_embedding and narration_cache is not None and get_embedder() is not None
+    if not (use_cache or needs_selection):
+        return text, None
+    chunks = chunk_text(text)
+    if not chunks:
+        return text, None
+
+    mat = embed_texts(chunks)
+    centroid = mat.mean(axis=0)
+    centroid /= np.linalg.norm(centroid) or 1.0
+
+    if needs_selection:
+        top_k = max(2, NARRATION_PROMPT_BUDGET_TOKENS // NARRATION_CHUNK_TOKENS)
+        ends = {0, len(chunks) - 1}  # intro and conclusion are rarely the most central chunks
+        ranked = [int(i) for i in np.argsort(mat @ centroid)[::-1] if int(i) not in ends]
+        keep = sorted(ends | set(ranked[:top_k - len(ends)]))
+        text = "\n\n".join(chunks[i] for i in keep)
+    return text, centroid if use_cache else None
+
+
+class NarrationCache:
+    """
+    Reuse narration (script + audio) for near-duplicate inputs.
+    Entries live in sqlite; lookups are a brute-force cosine over an in-memory matrix
+    of unit-normalized embeddings. The least recently used entries are evicted past `max_entries`.
+    """
+
+    def __init__(self, path: str, max_entries: int, threshold: float):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS narration_cache ("
+            "hash TEXT PRIMARY KEY, embedding BLOB, modality TEXT, script TEXT, audio BLOB, ts INTEGER)"
+        )
+        self._db.commit()
+        self._load_index()
+
+    def _load_index(self) -> None:
+        rows = self._db.execute("SELECT hash, modality, embedding FROM narration_cache").fetchall()
+        self._hashes = [row[0] for row in rows]
+        self._modalities = np.array([row[1] for row in rows], dtype=object)
+        if rows:
+            self._matrix = np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows])
+        else:
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+
+    @staticmethod
+    def _key(text: str, modality: str) -> str:
+        return hashlib.sha256(f"{modality}\x00{text}".encode("utf-8")).hexdigest()
+
+    def lookup(self, embedding: np.ndarray, modality: str) -> tuple[str, bytes] | None:
+        """Return (script, audio) of the most similar entry for `modality`, if above threshold."""
+        with self._lock:
+            if not self._hashes or self._matrix.shape[1] != embedding.shape[0]:
+                return None
+            sims = np.dot(self._matrix, embedding)
+            sims[self._modalities != modality] = -1.0
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            key = self._hashes[best]
+            row = self._db.execute(
+                "SELECT script, audio FROM narration_cache WHERE hash = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE narration_cache SET ts = ? WHERE hash = ?", (time.time_ns(), key)
+            )
+            self._db.commit()
+            return row[0], row[1]
+
+    def store(self, text: str, embedding: np.ndarray, modality: str, script: str, audio: bytes) -> None:
+        key = self._key(text, modality)
+        vec = embedding.astype(np.float32)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO narration_cache (hash, embedding, modality, script, audio, ts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, vec.tobytes(), modality, script, audio, time.time_ns()),
+            )
+            evicted = {
+                row[0]
+                for row in self._db.execute(
+                    "SELECT hash FROM narration_cache ORDER BY ts DESC LIMIT -1 OFFSET ?",
+                    (self.max_entries,),
+                )
+            }
+            self._db.executemany("DELETE FROM narration_cache WHERE hash = ?", [(h,) for h in evicted])
+            self._db.commit()
+
+            # update the in-memory index in place instead of re-reading every embedding blob
+            if key in self._hashes:
+                i = self._hashes.index(key)
+                self._matrix[i] = vec
+                self._modalities[i] = modality
+            elif self._hashes:
+                self._hashes.append(key)
+                self._modalities = np.append(self._modalities, np.array([modality], dtype=object))
+                self._matrix = np.vstack([self._matrix, vec])
+            else:
+                self._hashes = [key]
+                self._modalities = np.array([modality], dtype=object)
+                self._matrix = vec[np.newaxis, :]
+            if evicted:
+                keep = [i for i, h in enumerate(self._hashes) if h not in evicted]
+                self._hashes = [self._hashes[i] for i in keep]
+                self._modalities = self._modalities[keep]
+                self._matrix = self._matrix[keep]
+
+
+narration_cache = (
+    NarrationCache(NARRATION_CACHE_PATH, NARRATION_CACHE_MAX_ENTRIES, CACHE_SIM_THRESHOLD)
+    if SentenceTransformer is not None and CACHE_SIM_THRESHOLD <= 1
+    else None
+)
+
+
+# ---------- STREAMING PIPELINE ----------
+
+def narrate_streaming(raw_text: str, modality: str, deterministic: bool = False):
+    """
+    Overlap LLM generation with speech synthesis: each completed chunk of the streamed
+    script is sent to TTS while the model keeps writing.
+    Yields (script_chunk, mp3_fragment) pairs in script order.
+    """
+
+    def chunks():
+        pending, first = [], True
+        for sentence in stream_narration_sentences(raw_text, modality, deterministic):
+            pending.append(sentence)
+            # the first sentence goes out alone so audio starts as early as possible
+            if first or sum(map(len, pending)) >= TTS_CHUNK_CHARS:
+                yield " ".join(pending)
+                pending, first = [], False
+        if pending:
+            yield " ".join(pending)
+
+    with ThreadPoolExecutor(max_workers=TTS_PIPELINE_WORKERS) as pool:
+        futures = deque()
+        for text in chunks():
+            futures.append((text, pool.submit(text_to_speech, text)))
+            while futures and futures[0][1].done():
+                text_done, fut = futures.popleft()
+                yield text_done, fut.result()
+        while futures:
+            text_done, fut = futures.popleft()
+            yield text_done, fut.result()
+
+
 # ---------- CORE PROCESSING ----------
 
-def process_request_content(text_input: str | None, uploaded_file) -> tuple[str, str]:
+def extract_one(uploaded_file) -> tuple[str, str]:
+    """Extract (text, modality label) from a single uploaded file, dispatching on its extension."""
+    filename = uploaded_file.filename or ""
+    ext = (Path(filename).suffix or "").lower()
+
+    # Extractors read the spooled upload directly; only images need the bytes in memory
+    stream = uploaded_file.stream
+
+    if ext == ".pdf":
+        return extract_text_from_pdf(stream), "pdf-document"
+    elif ext in {".doc", ".docx"}:
+        return extract_text_from_docx(stream), "word-document"
+    elif ext in {".txt", ".md"}:
+        return extract_text_from_plain(stream), "text-document"
+    elif ext in {".xlsx", ".xls", ".csv"}:
+        df = read_table(stream, ext)
+        summary = summarize_table(df)
+        return summary, "structured-data"
+    elif ext in {".png", ".jpg", ".jpeg", ".gif", ".webp"}:
+        description = interpret_image_to_text(uploaded_file.read(), filename)
+        return description, "image-visual"
+    else:
+        # Fallback: treat as text
+        try:
+            stream.seek(0)
+            txt = stream.read().decode("utf-8", errors="ignore")
+        except Exception:
+            txt = ""
+        return txt or "Unable to parse file; it might be a binary format.", "unknown-file"
+
+
+def process_many(files: list) -> list[tuple[str, str]]:
+    """Parse several uploads concurrently (extraction is mostly I/O and C decoders); order is preserved."""
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_MAX_WORKERS, len(files))) as pool:
+        return list(pool.map(extract_one, files))
+
+
+def process_request_content(text_input: str | None, uploaded_files) -> tuple[str, str]:
     """
     Normalize all entry paths into:
     - normalized_text   (to feed into the Inflective loop)
     - modality label    (for the system prompt)
+    `uploaded_files` is a list of uploads (possibly empty); several files are
+    parsed in parallel and concatenated with per-file modality labels.
     """
-    if uploaded_file:
-        filename = uploaded_file.filename or ""
-        ext = (Path(filename).suffix or "").lower()
-
-        # Read bytes once
-        data = uploaded_file.read()
-        stream = io.BytesIO(data)
-
-        if ext == ".pdf":
-            return extract_text_from_pdf(stream), "pdf-document"
-        elif ext in {".doc", ".docx"}:
-            return extract_text_from_docx(stream), "word-document"
-        elif ext in {".txt", ".md"}:
-            return extract_text_from_plain(stream), "text-document"
-        elif ext in {".xlsx", ".xls", ".csv"}:
-            if ext == ".csv":
-                df = pd.read_csv(stream)
-            else:
-                df = pd.read_excel(stream)
-            summary = summarize_table(df)
-            return summary, "structured-data"
-        elif ext in {".png", ".jpg", ".jpeg", ".gif", ".webp"}:
-            description = interpret_image_to_text(data, filename)
-            return description, "image-visual"
-        else:
-            # Fallback: treat as text
-            try:
-                txt = data.decode("utf-8", errors="ignore")
-            except Exception:
-                txt = ""
-            return txt or "Unable to parse file; it might be a binary format.", "unknown-file"
+    files = [f for f in uploaded_files or [] if f]
+    if len(files) == 1:
+        return extract_one(files[0])
+    if files:
+        results = process_many(files)
+        combined = "\n\n".join(
+            f"[{modality}: {f.filename}]\n{text}" for f, (text, modality) in zip(files, results)
+        )
+        modalities = ", ".join(dict.fromkeys(modality for _, modality in results))
+        return combined, f"multi-file ({modalities})"
 
     # No file: see if it's a URL or plain text
     if text_input and looks_like_url(text_input):
@@ -328,22 +1083,39 @@ def api_process():
     Handles:
     - typed/pasted text (including URLs)
     - file uploads (PDF/Word/text/image/xlsx/csv)
-    Returns: MP3 audio only.
+    Returns: MP3 audio only, streamed as the narration is synthesized.
     """
     text_input = request.form.get("text", "")
-    uploaded_file = request.files.get("file")
+    uploaded_files = request.files.getlist("file")
 
-    normalized_text, modality = process_request_content(text_input, uploaded_file)
+    normalized_text, modality = process_request_content(text_input, uploaded_files)
 
     if not normalized_text.strip():
         normalized_text = "The user provided empty content. Briefly explain that there was nothing to read."
 
-    narration_script = run_inflective_emergence_loop(normalized_text, modality)
-    audio_bytes = text_to_speech(narration_script)
+    source_text, embedding = prepare_narration_source(normalized_text)
+
+    # Near-duplicate inputs reuse the cached narration and skip both OpenAI calls
+    cached = narration_cache.lookup(embedding, modality) if embedding is not None else None
+    if cached:
+        resp = make_response(cached[1])
+        resp.headers["Content-Type"] = "audio/mpeg"
+        return resp
+
+    def generate():
+        script_parts, audio_parts = [], []
+        # documents get stable narration; the exact cache below the semantic one serves reloads
+        deterministic = modality.split(" ", 1)[0] in DETERMINISTIC_MODALITIES  # "multi-file (...)"
+        for script_chunk, fragment in narrate_streaming(source_text, modality, deterministic=deterministic):
+            script_parts.append(script_chunk)
+            audio_parts.append(fragment)
+            yield fragment
+        if embedding is not None:
+            narration_cache.store(
+                normalized_text, embedding, modality, " ".join(script_parts), b"".join(audio_parts)
+            )
 
-    resp = make_response(audio_bytes)
-    resp.headers["Content-Type"] = "audio/mpeg"
-    return resp
+    return Response(generate(), mimetype="audio/mpeg")
 
 
 @app.route("/api/voice", methods=["POST"])
@@ -372,6 +1144,83 @@ def api_voice():
     return resp
 
 
+@app.route("/api/batch", methods=["POST"])
+def api_batch():
+    """
+    Offline bulk narration through the OpenAI Batch API (about half the token price, 24h window).
+    Accepts JSON: {"inputs": ["text or URL", ...]} with at most BATCH_MAX_INPUTS strings.
+    Returns: {"batch_id", "status"}; poll /api/batch/<batch_id> for the narration scripts.
+    TTS is not available through the Batch API, so results are scripts, not audio.
+    """
+    payload = request.get_json(silent=True)
+    inputs = payload.get("inputs") if isinstance(payload, dict) else None
+    if not isinstance(inputs, list) or not inputs:
+        return "No inputs provided", 400
+    if len(inputs) > BATCH_MAX_INPUTS:
+        return f"Too many inputs (max {BATCH_MAX_INPUTS})", 400
+    if not all(isinstance(item, str) for item in inputs):
+        return "Inputs must be strings", 400
+
+    lines = []
+    for i, item in enumerate(inputs):
+        normalized_text, modality = process_request_content(item, None)
+        source_text, _ = prepare_narration_source(normalized_text, with_embedding=False)
+        lines.append(json.dumps({
+            "custom_id": f"item-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": LLM_MODEL,
+                "messages": build_narration_messages(source_text, modality),
+                "temperature": 0,
+                "max_tokens": 1200,
+            },
+        }))
+
+    batch_file = client.files.create(file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return jsonify({"batch_id": batch.id, "status": batch.status}), 202
+
+
+@app.route("/api/batch/<batch_id>", methods=["GET"])
+def api_batch_status(batch_id: str):
+    """
+    Poll a submitted batch. Once it has finished (completed, or partially as expired/cancelled),
+    returns the narration script per processed input:
+    {"batch_id", "status", "results": [{"custom_id", "narration_script" | "error"}, ...]}
+    """
+    try:
+        batch = client.batches.retrieve(batch_id)
+    except NotFoundError:
+        return "Unknown batch", 404
+    body = {"batch_id": batch.id, "status": batch.status}
+    if batch.status not in {"completed", "expired", "cancelled"}:
+        return jsonify(body)
+
+    # successes land in the output file, failed requests in the error file; merged by custom_id
+    results = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                error = record.get("error") or response.get("body")
+                results[record["custom_id"]] = {"custom_id": record["custom_id"], "error": error}
+            else:
+                script = response["body"]["choices"][0]["message"]["content"]
+                results[record["custom_id"]] = {"custom_id": record["custom_id"], "narration_script": script}
+    body["results"] = sorted(results.values(), key=lambda r: int(r["custom_id"].split("-")[1]))
+    return jsonify(body)
+
+
 # ---------- INLINE FRONTEND ----------
 
 HTML_TEMPLATE = r"""
@@ -513,7 +1362,7 @@ HTML_TEMPLATE = r"""
       <label for="file-input" class="file-label" title="Upload file">
         📎
       </label>
-      <input id="file-input" type="file" />
+      <input id="file-input" type="file" multiple />
 
       <!-- Main text area -->
       <textarea id="text-input" placeholder="Paste text, drop a URL, or just speak…"></textarea>
@@ -551,8 +1400,8 @@ HTML_TEMPLATE = r"""
       const formData = new FormData();
       formData.append("text", textInput.value || "");
 
-      if (fileInput.files.length > 0) {
-        formData.append("file", fileInput.files[0]);
+      for (const file of fileInput.files) {
+        formData.append("file", file);
       }
 
       statusText.textContent = "Processing…";
@@ -625,15 +1474,16 @@ HTML_TEMPLATE = r"""
       analyser.fftSize = 2048;
       sourceNode.connect(analyser);
 
-      const dataArray = new Uint8Array(analyser.fftSize);
+      // Float samples are already normalized to [-1, 1]; no per-sample rescaling needed
+      const dataArray = new Float32Array(analyser.fftSize);
       let lastNonSilent = performance.now();
 
       function checkSilence() {
-        analyser.getByteTimeDomainData(dataArray);
-        // Compute RMS-ish magnitude
+        analyser.getFloatTimeDomainData(dataArray);
+        // Compute RMS magnitude
         let sum = 0;
         for (let i = 0; i < dataArray.length; i++) {
-          const v = (dataArray[i] - 128) / 128.0;
+          const v = dataArray[i];
           sum += v * v;
         }
         const rms = Math.sqrt(sum / dataArray.length);
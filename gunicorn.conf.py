@@ -0,0 +1,16 @@
+"""
+Gunicorn settings; `gunicorn app:app` picks this file up automatically.
+
+The hot path spends nearly all its time waiting on OpenAI and remote URLs, so each
+worker runs gevent greenlets instead of blocking one OS thread per request.
+The gevent worker monkey-patches sockets/threading before app.py is imported,
+so keep preload_app off.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gevent"
+worker_connections = 100
+timeout = 120  # narration of long documents can take a while